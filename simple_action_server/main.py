@@ -1,22 +1,38 @@
-import cgi
+import io
 import logging
 import os
+import re
+import socket
 import sys
-import tempfile
 import threading
 from http import HTTPStatus
 from http.server import __version__ as http_version, HTTPServer, SimpleHTTPRequestHandler  # noqa
-# Use from..import for importlib as it needs to bootstrap some stuff before  "util" etc works, which import doesn't do
-from importlib import import_module, util as importlib_util
+from importlib import import_module
+from socketserver import ThreadingMixIn
 from time import sleep
 from typing import AnyStr, Callable, Optional
-from urllib.parse import parse_qs, ParseResult, urlparse
+from urllib.parse import parse_qs, parse_qsl, ParseResult, urlparse
 
 logger = logging.getLogger(__name__)
 
+_VERBS = ('GET', 'POST', 'HEAD', 'PUT')
+# Function name prefixes per verb, in order of precedence
+_PREFIXES = {verb: (verb.lower() + '_', 'any_', '') for verb in _VERBS}
+
+# Response bodies up to this size are sent in the same write as the headers
+_COALESCE_LIMIT = 64 * 1024
+# The (non-empty) segments of a url path
+_PATH_SEGMENTS = re.compile(r'[^/]+')
+# Identifier prefix per verb (in both cases), so composing an identifier doesn't need to upper() the verb every time
+_VERB_PREFIXES = {verb: verb + ' ' for verb in _VERBS + ('ANY',)}
+_VERB_PREFIXES.update({verb.lower(): prefix for verb, prefix in _VERB_PREFIXES.items()})
+
 
 def action_identifier(verb: str, url: str) -> str:
-    return verb.upper() + ' ' + url
+    prefix = _VERB_PREFIXES.get(verb)
+    if prefix is None:
+        prefix = verb.upper() + ' '
+    return prefix + url
 
 
 class Action:
@@ -25,21 +41,52 @@ class Action:
         self.handler = handler
         self.origin = origin
         self._kwargs = kwargs
+        self._error = None
 
     def nextcall(self, **kwargs) -> 'Action':
         self._kwargs = kwargs
+        self._error = None
         return self
 
+    def as_error(self) -> 'Action':
+        """
+        This action (including its kwargs) as an error handler. Only created once
+        """
+        if self.origin == 'error':
+            return self
+        if self._error is None:
+            self._error = Action(self.handler, 'error', **self._kwargs)
+        return self._error
+
     def __call__(self, *args, **kwargs):
-        final_kwargs = dict(**self._kwargs)
-        final_kwargs.update(kwargs)
-        return self.handler(*args, **final_kwargs)
+        if not self._kwargs:
+            return self.handler(*args, **kwargs)
+        return self.handler(*args, **{**self._kwargs, **kwargs})
+
+
+class FormField:
+    """
+    A posted form field for the bodies we parse ourselves, mimics the interface of cgi.MiniFieldStorage
+    """
+
+    def __init__(self, name: str, value, filename: str = None, type: str = None):
+        self.name = name
+        self.value = value
+        self.filename = filename
+        self.type = type
+
+    @property
+    def file(self):
+        return io.BytesIO(self.value if isinstance(self.value, bytes) else str(self.value).encode())
+
+    def __repr__(self):
+        return 'FormField(%r, %r)' % (self.name, self.value)
 
 
 class ActionRequestHandlerMeta(type):
     """
     Meta class with "class level" properties for the request handler below.
-    Since every request results in a new instance, this is a way to provide properties for easy of use
+    Since every connection results in a new instance, this is a way to provide properties for easy of use
     """
 
     def __init__(cls, *args, **kwargs):
@@ -75,10 +122,12 @@ class ActionRequestHandlerMeta(type):
 
     @actions.setter
     def actions(cls, actions: dict):
-        cls._actions = actions
+        # Normalize once: interned identifiers (their hash is cached) and everything wrapped in an Action
+        cls._actions = {sys.intern(identifier): action if isinstance(action, Action) else Action(action, 'direct')
+                        for identifier, action in actions.items()}
 
     def add_action(cls, verb: str, url: str, handler: Callable, origin: str = 'direct'):
-        cls._actions[action_identifier(verb, url)] = Action(handler, origin)
+        cls._actions[sys.intern(action_identifier(verb, url))] = Action(handler, origin)
 
     def remove_action(cls, verb: str, url: str, ):
         del cls._actions[action_identifier(verb, url)]
@@ -103,42 +152,127 @@ class ActionRequestHandlerMeta(type):
 
 class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHandlerMeta):
     _action_modules = None
+    _action_index = None
+    _catchalls = None
+    _load_lock = threading.Lock()
     server_version = 'SimpleActionHTTP/' + http_version
+    # Enables keep-alive, so clients can reuse their connection for subsequent requests
+    protocol_version = 'HTTP/1.1'
+    # Seconds an idle (keep-alive) connection may wait for its next request before it is closed, since each
+    # connection occupies a thread
+    timeout = 30
+    # Responses are small and mostly written in one go, don't let them wait for more data
+    disable_nagle_algorithm = True
 
     def __init__(self, *args, **kwargs):
-        self._file_path = None
-        self._mime_type = None
-        self._parsed_url = None
-        self._response_sent = False
+        self._reset_request()
         super().__init__(*args, **kwargs)
 
-    def do_GET(self):
-        self._dispatch()
+    def handle_one_request(self):
+        # With keep-alive the same instance handles all requests of a connection, start each of them clean
+        self._reset_request()
+        super().handle_one_request()
+
+        if self.close_connection:
+            return
+
+        if not self._length_sent:
+            # Without a length the client can only tell where the response ends by us closing the connection
+            # (actions using send_response()/end_headers()/wfile.write() directly, or no response at all)
+            self.close_connection = True
+        elif 'transfer-encoding' in self.headers:
+            # We never decode chunked bodies, whatever is left of it would be parsed as the next request
+            self.close_connection = True
+        elif self.headers.get('content-length', '0') != '0' and not self._body_read:
+            # Same for a body that wasn't (fully) read: we don't know what an action did with it or where it ends
+            self.close_connection = True
+
+    def log_error(self, format, *args):
+        if format.startswith('Request timed out'):
+            # That is how an idle keep-alive connection ends (see timeout), nothing went wrong
+            logger.debug("Closing idle connection from %s", self.address_string())
+            return
+        super().log_error(format, *args)
+
+    def _reset_request(self):
+        self._parsed_url = None
+        self._path_parts = None
+        self._query = None
+        self._resolved_action = None
+        self._response_sent = False
+        self._length_sent = False
+        self._body_read = False
 
     def do_POST(self):
         form = {}
         files = {}
-        if self.headers['content-type'].endswith('/json'):
+        # Like cgi, treat a post without content type as a regular (urlencoded) form post
+        content_type = self.headers.get_content_type() if 'content-type' in self.headers \
+            else 'application/x-www-form-urlencoded'
+        content_len = int(self.headers.get('content-length', 0))
+        if content_type == 'application/x-www-form-urlencoded':
+            # By far the most common form post and simple enough not to need cgi
+            content = self._read_body(content_len).decode('UTF-8', 'replace')
+            for k, v in parse_qsl(content, keep_blank_values=True):
+                form.setdefault(k, []).append(FormField(k, v))
+        elif content_type.endswith('/json'):
             # Support json posts as well, fake cgi fields
             import json
-            content_len = int(self.headers.get('content-length', 0))
-            content = json.loads(self.rfile.read(content_len))
+            content = json.loads(self._read_body(content_len))
             for k, v in content.items():
-                form.setdefault(k, []).append(cgi.MiniFieldStorage(k, v))
+                form.setdefault(k, []).append(FormField(k, v))
         else:
-            fields = cgi.FieldStorage(self.rfile, self.headers, environ={'REQUEST_METHOD': 'POST'})
-            for f in fields.list:
+            for f in self._parse_multipart(content_len):
                 target = files if f.filename else form
                 # Since HTTP allows for the same field to be present multiple times, add as list
                 target.setdefault(f.name, []).append(f)
 
         self._dispatch(form, files)
 
-    def do_HEAD(self):
-        self._dispatch()
+    def _parse_multipart(self, content_len: int) -> list:
+        """
+        Parse a multipart (or any other non-urlencoded) post body into fields.
+        Uses cgi if available (it spools large uploads to disk), the email parser otherwise (cgi was removed in 3.13)
+        :param content_len:
+        :return:
+        """
+        try:
+            # Only needed here and fairly expensive to import, so postpone until the first multipart POST
+            import cgi
+        except ImportError:
+            cgi = None
 
-    def do_PUT(self):
-        self._dispatch()
+        if cgi:
+            fields = cgi.FieldStorage(self.rfile, self.headers, environ={'REQUEST_METHOD': 'POST'})
+            self._body_read = fields.bytes_read >= content_len
+            return fields.list or []
+
+        from email.parser import BytesParser
+        from email.policy import HTTP
+        header = b'Content-Type: ' + self.headers.get('content-type', '').encode('latin-1') + b'\r\n\r\n'
+        message = BytesParser(policy=HTTP).parsebytes(header + self._read_body(content_len))
+        if not message.is_multipart():
+            return []
+
+        fields = []
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            filename = part.get_filename()
+            value = part.get_payload(decode=True) or b''
+            if not filename:
+                value = value.decode(part.get_content_charset('UTF-8'), 'replace')
+            fields.append(FormField(name, value, filename, part.get_content_type()))
+        return fields
+
+    def _read_body(self, content_len: int) -> bytes:
+        """
+        Read the request body, keeping track of whether we got all of it
+        :param content_len:
+        :return:
+        """
+        body = self.rfile.read(content_len)
+        self._body_read = len(body) == content_len
+        return body
 
     def send_json(self, content=None, path=None):
         """
@@ -146,7 +280,7 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
         :param path: Physical path on the disk if this is a pre-existing file
         :param content: File content to use if not a file (str, dict, bytes)
         """
-        if not isinstance(content, bytes):
+        if not path and not isinstance(content, bytes):
             import json
             content = json.dumps(content) + '\n'
         if isinstance(content, str):
@@ -154,62 +288,79 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
         self.send_file(path, content, 'application/json')
 
     def send_file(self, path=None, content: bytes = None, type=None):
-        if content:
+        """
+        Send a file from disk or in-memory content to the client. Reports "200 OK" unless a status was already sent.
+        :param path: Physical path on the disk if this is a pre-existing file
+        :param content: File content to use if not a file
+        :param type: Mime type of the content, required when sending content. Guessed from the path otherwise
+        """
+        if content is not None:
             if not type:
                 raise RuntimeError('Cannot determine mime type based on content, please specify')
 
-            (fd, path) = tempfile.mkstemp()
-            os.write(fd, content)
-
-        # Temp-store the path & mime type so we can "dummy return" them
-        self._file_path = path
-        self._mime_type = type
-        # Try to send the header already, this results in a file if successful
-        f = self.send_head()
-
-        if f:
-            try:
-                # Copy the file to the client
-                self.copyfile(f, self.wfile)
-            finally:
-                f.close()
+            # We already have the content, no need to go via the disk
+            self._send_content_headers(type, len(content), body=content)
+            return
 
-        if content:
-            os.close(fd)
-            os.unlink(path)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, 'File not found')
+            return
 
-    def translate_path(self, path):
+        with f:
+            stat = os.fstat(f.fileno())
+            self._send_content_headers(type or self.guess_type(path), stat.st_size, stat.st_mtime)
+            if self.command != 'HEAD':
+                # Uses sendfile(2) where supported (and falls back to regular sends otherwise)
+                self.connection.sendfile(f)
+
+    def _send_content_headers(self, content_type: str, length: int, modified: float = None, body: bytes = None):
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(length))
+        if modified is not None:
+            self.send_header('Last-Modified', self.date_time_string(modified))
+        self._end_headers(body)
+
+    def _end_headers(self, body: bytes = None):
         """
-        Override the base function and return the same path, since we're already working with those
-        (we only use the send-file functionality, not the entire file hosting)
-        :param path:
-        :return:
+        Like end_headers(), but a small body goes out in the same write as the (buffered) headers. Larger bodies are
+        written separately, joining them would mean copying the entire body just to save a single write
+        :param body:
         """
-        return self._file_path
+        if self.command == 'HEAD':
+            body = None
 
-    def guess_type(self, path):
-        """
-        Override that supports pre-specified type
-        :param path:
-        :return:
-        """
-        return self._mime_type if self._mime_type else super().guess_type(path)
+        if body and len(body) <= _COALESCE_LIMIT and self.request_version != 'HTTP/0.9':
+            self._headers_buffer.append(b'\r\n')
+            self._headers_buffer.append(body)
+            self.flush_headers()
+            return
+
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
 
     def reply(self, http_code: int, response_message: str = None, content: AnyStr = None, content_type: AnyStr = None):
         self.send_response(http_code, response_message)
 
         body = None
         if content:
-            body = content.encode('UTF-8', 'replace')
+            body = content if isinstance(content, (bytes, bytearray)) else content.encode('UTF-8', 'replace')
             # If we have content, make sure to add the correct headers
             if content_type:
                 self.send_header("Content-Type", content_type)
-            self.send_header('Content-Length', str(len(content)))
-
-        self.end_headers()
 
-        if body:
-            self.wfile.write(body)
+        if http_code < 200 or http_code in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+            # These never have a body and must not carry a Content-Length, their end is known to the client regardless
+            body = None
+            self._length_sent = True
+        else:
+            # The length of the encoded body (that differs from the str length for anything non-ASCII). Always sent,
+            # since that is how a keep-alive client knows where the response ends
+            self.send_header('Content-Length', str(len(body)) if body else '0')
+        self._end_headers(body)
 
     def success(self, response_message: str = None, content=None, content_type=None):
         """
@@ -218,26 +369,27 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
         self.reply(HTTPStatus.OK, response_message, content, content_type)
 
     def handle_expect_100(self):
-        (action, _) = self._find_action(self.path)
-        if action.origin == 'error':
+        action = self._find_action()
+        if not action or action.origin == 'error':
             self.send_404()
             return False
 
         return super().handle_expect_100()
 
     def _dispatch(self, form=None, files=None):
-        action = self._find_action(self.path)
+        action = self._find_action()
 
         if action and action.origin == 'error':
-            logger.debug("Calling error handler for [%s %s]" % (self.command, self.parsed_url.path))
+            logger.debug("Calling error handler for [%s %s]", self.command, self.parsed_url.path)
 
         if action:
             parameters = {
-                "url": self.parsed_url
+                "url": self.parsed_url,
+                "original_url": self.parsed_url,
             }
 
             if self.parsed_url.query:
-                parameters['query'] = parse_qs(self.parsed_url.query)
+                parameters['query'] = self.query
 
             if form:
                 parameters['form'] = form
@@ -259,15 +411,24 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
             else:
                 worker()
         else:
-            logger.error("No action for [%s %s]" % (self.command, self.parsed_url.path))
+            logger.error("No action for [%s %s]", self.command, self.parsed_url.path)
             self.send_404()
 
+    # Verbs without a body to parse can go straight to the dispatcher
+    do_GET = do_HEAD = do_PUT = _dispatch
+
     def send_response(self, code, message=None):
         """Limit response sending to once"""
         if not self._response_sent:
             self._response_sent = True
             super().send_response(code, message)
 
+    def send_header(self, keyword, value):
+        """Keep track of whether the response has a length, keep-alive depends on it"""
+        if keyword.lower() == 'content-length':
+            self._length_sent = True
+        super().send_header(keyword, value)
+
     def send_404(self):
         self.send_error(HTTPStatus.NOT_FOUND)
 
@@ -275,12 +436,39 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
     def parsed_url(self) -> ParseResult:
         if not self._parsed_url:
             self._parsed_url = urlparse(self.path)
+            self._path_parts = tuple(_PATH_SEGMENTS.findall(self._parsed_url.path))
         return self._parsed_url
 
-    def _find_action(self, path: str) -> Optional[Action]:
-        action_name = self._request_identifier()
+    @property
+    def path_parts(self) -> tuple:
+        """
+        The non-empty segments of the url path
+        """
+        if self._path_parts is None:
+            self.parsed_url  # noqa
+        return self._path_parts
 
-        prefixes = [self.command.lower(), 'any', '']
+    @property
+    def query(self) -> dict:
+        """
+        The parsed query string of the url, parsed on first use
+        """
+        if self._query is None:
+            self._query = parse_qs(self.parsed_url.query)
+        return self._query
+
+    def _find_action(self) -> Optional[Action]:
+        """
+        Find the action for the current request. The result is kept so that (for example) the expect-100 check and
+        the dispatching don't need to resolve it both
+        :return:
+        """
+        if self._resolved_action is None:
+            self._resolved_action = self._lookup_action()
+        return self._resolved_action
+
+    def _lookup_action(self) -> Optional[Action]:
+        action_name = self._request_identifier()
 
         # load the "top level" action modules
         self._load_action_modules()
@@ -290,50 +478,41 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
             return self._actions[action_name]
 
         for identifier in self._action_modules:
-
-            parts = list(filter(None, urlparse(path).path.split('/')))
-            (module, parts) = self._find_module(identifier, parts)
+            ((handlers, catchalls, _), parts_left) = self._find_module(identifier, self.path_parts)
 
             # If we still have parts left, that will be (part of) the function name
-            if module:
-                if parts:
-                    remainder = []
-                    while parts:
-                        # Function name is a combo of the remaining parts
-                        function = '_'.join(parts)
-                        # With optional <COMMAND>, "any" or no prefix
-                        for prefix in prefixes:
-                            try_function = '_'.join([prefix, function]).lstrip('_')
-                            if hasattr(module, try_function):
-                                return self._save_action(action_name, getattr(module, try_function),
-                                                         'direct' if not remainder else 'fallback')
-
-                        if not self._fallback:
-                            # No falling back to broader modules supported, abort
-                            break
-
-                        # Still here and we appear to have fallback enabled, pop the least significant part and try
-                        # again for a broader action function
-                        remainder.insert(0, parts.pop(-1))
-                else:
-                    method = self._find_catchall(module, self.command)
+            if parts_left:
+                handlers = handlers.get(self.command, {})
+                depth = len(parts_left)
+                while depth:
+                    # Function name is a combo of the remaining parts, the prefixes were resolved when indexing
+                    method = handlers.get('_'.join(parts_left[:depth]))
                     if method:
-                        # Since this is a dedicated module, we still consider it a direct origin
-                        return self._save_action(action_name, method, 'direct')
+                        return self._save_action(action_name, method,
+                                                 'direct' if depth == len(parts_left) else 'fallback')
 
-        # Still here, look through all of the modules again and find the first catch-all function that is either the
-        # VERB/COMMAND or "any"
-        for _, module in self._action_modules.items():
-            module = module[0]
-            method = self._find_catchall(module, self.command)
-            if method:
-                return self._save_action(action_name, method, 'catchall')
+                    if not self._fallback:
+                        # No falling back to broader modules supported, abort
+                        break
+
+                    # Still here and we appear to have fallback enabled, drop the least significant part and try
+                    # again for a broader action function
+                    depth -= 1
+            else:
+                method = catchalls.get(self.command)
+                if method:
+                    # Since this is a dedicated module, we still consider it a direct origin
+                    return self._save_action(action_name, method, 'direct')
+
+        # Still here, use the first catch-all function of the action sources that is either the VERB/COMMAND or "any"
+        method = self._catchalls.get(self.command)
+        if method:
+            return self._save_action(action_name, method, 'catchall')
 
         # Do we have 404 actions?
-        for prefix in [self.command, 'ANY']:
-            name = ' '.join([prefix, '404']).strip()
+        for name in (action_identifier(self.command, '404'), action_identifier('ANY', '404')):
             if name in self._actions:
-                return Action(self._actions[name], 'error')
+                return self._actions[name].as_error()
 
         # nothing found, use default functionality
         return None
@@ -342,66 +521,108 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
         return action_identifier(self.command, self.parsed_url.path)
 
     def _save_action(self, action_name, method, origin):
-        logger.debug(
-            'Action "%s" was mapped to "%s.%s" [%s]' % (action_name, method.__module__, method.__name__, origin))
+        if action_name in self._actions:
+            # Another thread resolved the same request in the mean time
+            return self._actions[action_name]
+
+        # Not every callable (partials, instances) has a name
+        logger.debug('Action "%s" was mapped to "%s.%s" [%s]', action_name, getattr(method, '__module__', None),
+                     getattr(method, '__name__', method), origin)
 
-        self._actions[action_name] = Action(method, origin, original_url=self.parsed_url)
+        self._actions[sys.intern(action_name)] = Action(method, origin)
         return self._actions[action_name]
 
-    def _find_module(self, identifier: str, parts: list):
+    def _find_module(self, identifier: str, parts: tuple):
         """
-        Given the module identified by "identifier", try to enumerate into its submodules as deep as possible using
-        the parts list and return the found module and the remaining parts.
+        Given the action source identified by "identifier", walk its index as deep as possible using the parts and
+        return the lookup tables of the found (sub)module and the remaining parts.
         :param identifier:
         :param parts:
         :return:
         """
+        node = self._action_index[identifier]
+        depth = 0
+        while depth < len(parts):
+            child = node[2].get(parts[depth])
+            if child is None:
+                break
+            node = child
+            depth += 1
 
-        parts = list(parts)
-        (module, origin) = self._action_modules[identifier]
+        return node, parts[depth:]
 
-        if origin == 'module':
-            (module, loaded_parts) = self._load_sub_module(module, parts)
-            if isinstance(loaded_parts, str):
-                loaded_parts = loaded_parts.split('.')
-            parts = parts[len(loaded_parts) if loaded_parts else 0:]
+    @staticmethod
+    def _index_module(module) -> tuple:
+        """
+        Build the lookup tables for a single action module: for every verb a dict that maps the function name (as
+        derived from the url) on the handler, with the "<verb>_", "any_" and plain prefixes already resolved in order
+        of precedence. Next to that a dict with the catch-all handler ("<verb>" or "any") per verb and an (initially
+        empty) dict for the tables of its submodules.
+        :param module:
+        :return:
+        """
+        # Straight from the module dict: no dir()/getattr() round trip and no module level __getattr__ hooks triggered.
+        # Any callable will do (decorated/cached functions, partials, callable instances), except for classes
+        functions = {name: function for name, function in vars(module).items()
+                     if not name.startswith('_') and callable(function) and not isinstance(function, type)}
+
+        handlers = {}
+        catchalls = {}
+        for verb in _VERBS:
+            table = {}
+            # Least significant prefix first, so the more specific ones overwrite it
+            for prefix in reversed(_PREFIXES[verb]):
+                for name, function in functions.items():
+                    if len(name) > len(prefix) and name.startswith(prefix):
+                        table[name[len(prefix):]] = function
+            handlers[verb] = table
+
+            catchall = functions.get(verb.lower(), functions.get('any'))
+            if catchall:
+                catchalls[verb] = catchall
+
+        return handlers, catchalls, {}
 
-        elif origin == 'path':
-            # See how "low" we can go directory-wise first
-            while parts:
-                part = parts.pop(0)
-                try_dir = os.path.join(base, part)
-                if not os.path.isdir(try_dir):
-                    parts.insert(0, part)
-                    break
-                base = try_dir
+    @classmethod
+    def _index_action_source(cls, root) -> dict:
+        """
+        Walk the given action source and build the lookup tables for it and all of its submodules, nested by their
+        name parts (relative to the source).
+        :param root:
+        :return:
+        """
+        index = cls._index_module(root)
+        if not hasattr(root, '__path__'):
+            # Not a package, nothing more to explore
+            return index
 
-            # now that we know in which directory we'll need to find the logic:
-            sys.path.append(os.path.abspath(base))
-            file = parts.pop(0)
-            module = import_module(file)
+        # Only needed while indexing, so postpone the import until then
+        import pkgutil
 
-        return module, parts
+        prefix = root.__name__ + '.'
+        # Errors are reported when we import the module ourselves, no need to do that twice
+        for info in pkgutil.walk_packages(root.__path__, prefix, onerror=lambda name: None):
+            try:
+                # Currently this refuses to load packages/modules containing relative imports, even with package= set
+                # Need to figure out how to best handle that but haven't found a way yet
+                module = import_module(info.name)
+            except Exception as e:
+                logger.warning('Unable to load module "%s" : Coding error? Exception was: %r', info.name, e)
+                continue
+
+            # Packages are walked before their submodules, so the parent is always indexed already
+            parts = info.name[len(prefix):].split('.')
+            parent = index
+            for part in parts[:-1]:
+                parent = parent[2][part]
+            parent[2][parts[-1]] = cls._index_module(module)
 
-    def _find_catchall(self, module, command):
-        methods = [command.lower(), 'any']
-        for method in methods:
-            if hasattr(module, method):
-                return getattr(module, method)
+        return index
 
     @classmethod
     def _load_sub_module(cls, module, segments):
         parts = segments.split('.') if isinstance(segments, str) else segments
 
-        take_away = 0
-        if isinstance(module, tuple):
-            # Tuple means we're messing with submodules here because an action module path was specified
-            new_parts = module[3].split('.')
-            take_away = len(new_parts)
-            new_parts.extend(parts)
-            parts = new_parts
-            module = module[1]
-
         new_module = None
         while parts:
             name = module.__package__ + '.' + '.'.join(parts)
@@ -411,27 +632,50 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
                 new_module = import_module(name)
                 break
             except ModuleNotFoundError as e:
-                logger.debug('Tried "%s", but got "not found" (%r)' % (name, e))
+                logger.debug('Tried "%s", but got "not found" (%r)', name, e)
                 parts.pop()
             except Exception as e:
-                logger.warning('Unable to load module "%s" : Coding error? Exception was: %r' % (name, e))
+                logger.warning('Unable to load module "%s" : Coding error? Exception was: %r', name, e)
                 parts.pop()
 
-        if parts and take_away:
-            parts = parts[take_away:]
-
         return new_module, '.'.join(parts) if parts else None
 
     @classmethod
     def _load_action_modules(cls):
         """
-        Given a list of action sources, load the top level modules for each
+        Given a list of action sources, load the top level modules for each and index them (and their submodules)
+        so finding the action for a request doesn't require any module introspection.
         :return:
         """
         if cls._action_modules is not None:
             return
 
-        cls._action_modules = {}
+        with cls._load_lock:
+            if cls._action_modules is not None:
+                # Another request thread beat us to it
+                return
+
+            action_modules = cls._import_action_sources()
+            cls._action_index = {identifier: cls._index_action_source(module)
+                                 for identifier, (module, _) in action_modules.items()}
+
+            # The catch-all handlers of the action sources themselves, the first source to have one wins
+            cls._catchalls = {}
+            for index in cls._action_index.values():
+                (_, catchalls, _) = index
+                for verb, method in catchalls.items():
+                    cls._catchalls.setdefault(verb, method)
+
+            # Assigned last, since this is what tells the other threads everything is ready
+            cls._action_modules = action_modules
+
+    @classmethod
+    def _import_action_sources(cls) -> dict:
+        """
+        Import the top level module of every action source
+        :return:
+        """
+        action_modules = {}
         for item in cls.action_sources:
             name = None
             path = None
@@ -452,31 +696,55 @@ class ActionRequestHandler(SimpleHTTPRequestHandler, metaclass=ActionRequestHand
 
             try:
                 if name:
-                    spec = importlib_util.find_spec(name)  # noqa
-                    if spec:
-                        module = spec.loader.load_module()
-                        if actions:
-                            # If an actions sub module was specified, load it based on the main modul;e
-                            (new_module, path) = cls._load_sub_module(module, actions)
-                            if path == actions:
-                                # Only register as active if we managed to load the full path
-                                cls._action_modules[name] = ((new_module, module, spec, path), 'module')
-                            else:
-                                logger.error('Unable to load "%s"-actions sub-module for "%s"'
-                                             ' ("%s" loaded): ignoring module' % (actions, name, path))
+                    # import_module reuses what is already in sys.modules, where load_module() would execute the
+                    # module all over again
+                    module = import_module(name)
+                    if actions:
+                        # If an actions sub module was specified, load it based on the main module
+                        (new_module, path) = cls._load_sub_module(module, actions)
+                        if path == actions:
+                            # Only register as active if we managed to load the full path
+                            action_modules[name] = (new_module, 'module')
                         else:
-                            cls._action_modules[name] = (module, 'module')
+                            logger.error('Unable to load "%s"-actions sub-module for "%s"'
+                                         ' ("%s" loaded): ignoring module', actions, name, path)
+                    else:
+                        action_modules[name] = (module, 'module')
                 elif path:
-                    # Load from path physical path...
-                    abs_path = os.path.abspath(path)
-                    sys.path.append(abs_path)
-                    cls._action_modules[path] = (import_module(os.path.basename(abs_path)), 'path')
+                    # Load from path physical path: make its parent importable and load it like any other module, so
+                    # it is indexed (and its submodules) the same way
+                    (directory, file) = os.path.split(os.path.abspath(path))
+                    sys.path.append(directory)
+                    action_modules[path] = (import_module(os.path.splitext(file)[0]), 'module')
 
             except ModuleNotFoundError:
-                logger.error('Unable to load module "%s"' % name)
+                logger.error('Unable to load module "%s"', name or path)
+
+        return action_modules
+
+
+class ActionHTTPServer(ThreadingMixIn, HTTPServer):
+    """
+    Handles every request in its own thread, so a slow action doesn't block all other clients
+    """
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, server_address, RequestHandlerClass, bind_and_activate: bool = True, reuse_port: bool = False):
+        # Per instance (and before binding), so it doesn't affect any other server
+        self.allow_reuse_port = reuse_port
+        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
+
+    if sys.version_info < (3, 11):
+        def server_bind(self):
+            # Python < 3.11 doesn't support allow_reuse_port itself
+            if self.allow_reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            super().server_bind()
 
 
-def serve(host_name: str = '', host_port: int = 8080, actions: dict = None, action_sources: list = None):
+def serve(host_name: str = '', host_port: int = 8080, actions: dict = None, action_sources: list = None,
+          reuse_port: bool = False):
     """
     Start a simple action server on host_name/host_port, optionally pre-specifying actions
     :param host_name: listen on this IP (empty = all interfaces)
@@ -484,6 +752,7 @@ def serve(host_name: str = '', host_port: int = 8080, actions: dict = None, acti
     :param actions: dict of actions to method. Action identifier is VERB + absolute URI (eg 'POST /ping").
     :param action_sources: List of strings (if you are specifying module identifiers) where the action methods can be
                            looked for.
+    :param reuse_port: Allow multiple server processes to listen on the same port (SO_REUSEPORT)
     :return:
     """
     if actions:
@@ -492,8 +761,8 @@ def serve(host_name: str = '', host_port: int = 8080, actions: dict = None, acti
     action_sources = action_sources if action_sources else ['.'.join(__name__.split('.')[:-1]) + '.actions']
     ActionRequestHandler.action_sources = action_sources
 
-    server = HTTPServer((host_name, host_port), ActionRequestHandler)
-    logger.info("START - %s:%s" % (host_name, host_port))
+    server = ActionHTTPServer((host_name, host_port), ActionRequestHandler, reuse_port=reuse_port)
+    logger.info("START - %s:%s", host_name, host_port)
 
     try:
         server.serve_forever()
@@ -501,7 +770,7 @@ def serve(host_name: str = '', host_port: int = 8080, actions: dict = None, acti
         pass
 
     server.server_close()
-    logger.info("END - %s:%s" % (host_name, host_port))
+    logger.info("END - %s:%s", host_name, host_port)
 
 if __name__ == '__main__':
     serve()